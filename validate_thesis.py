@@ -16,103 +16,400 @@ Success criteria:
 IF ANY FAIL → STOP PROJECT (no exploitable edge exists)
 """
 
-import requests
-import json
+import asyncio
+import math
+import os
+import random
+import re
+import signal
+import sqlite3
 import time
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 import csv
-import statistics
+
+import aiohttp
+import numpy as np
+import orjson
+from scipy.special import erf
+
+try:
+    import brotli  # lets aiohttp decode "br" responses
+except ImportError:
+    brotli = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 # Configuration
 TARGET_CITIES = ["London", "New York", "Chicago"]
 GAMMA_API_URL = "https://gamma-api.polymarket.com/markets"
+GAMMA_TAGS_URL = "https://gamma-api.polymarket.com/tags/slug"
 RESULTS_CSV = "thesis_validation_results.csv"
+RESULTS_PARQUET = "thesis_validation_results.parquet"
 VALIDATION_DAYS = 14
+DAY_INTERVAL = 86400  # seconds between daily snapshots; lower it for quick test runs
+DAY_FETCH_TIMEOUT = 120  # seconds allowed for each of a day's fetches
+VALIDATION_THRESHOLD = 15.0  # °C (59°F) - default until thresholds are parsed
+GRID_CACHE_TTL = 86400  # seconds - NWS grid points are effectively static
+FORECAST_STD_DEV = 2.5  # °C - σ of the forecast error model
+FORECAST_STD_DEV_F = FORECAST_STD_DEV * 9.0 / 5.0  # same σ in °F
+_INV_SIGMA_SQRT2 = 1.0 / (FORECAST_STD_DEV_F * math.sqrt(2.0))  # z / √2 as one multiply
+FORECAST_CACHE_TTL = 3600  # seconds - NWS hourly forecast update cadence
+FORECAST_CACHE_JITTER = 0.1  # ±10% of TTL so cities don't expire together
+
+# HTTP client settings
+HTTP_HEADERS = {
+    "User-Agent": "PolymarketValidation/1.0",
+    "Accept-Encoding": "gzip, deflate, br" if brotli else "gzip, deflate",
+}
+HTTP_TIMEOUT = 10  # seconds per request
+HTTP_POOL_PER_HOST = 15  # pooled connections per host
+HTTP_POOL_SIZE = 2 * HTTP_POOL_PER_HOST  # total: Gamma and NWS hosts at full width
+HTTP_RETRIES = 3  # retries after the first attempt
+HTTP_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+HTTP_MAX_RETRY_AFTER = 30  # seconds; a longer Retry-After fails the request
+HTTP_CACHE_PATH = ".cache/http_cache.sqlite"  # survives re-runs of the script
+HTTP_CACHE_TTL = 3600  # seconds - NWS hourly cadence; 0 disables the disk cache
+
+# Result storage: one row per scored market, columns stored contiguously
+RESULT_DTYPE = np.dtype([
+    ('edge', 'f4'),
+    ('forecast_prob', 'f4'),
+    ('market_price', 'f4'),
+    ('threshold', 'f4'),
+    ('city_id', 'u1'),  # index into TARGET_CITIES
+    ('date', 'M8[D]'),
+])
+MAX_OPPS_PER_DAY = 64  # initial capacity per day; grows if exceeded
+CITY_IDS = {city: i for i, city in enumerate(TARGET_CITIES)}
+
+# Gamma API pagination
+MARKETS_PAGE_SIZE = 100
+# Pages in flight (within the 30 req/s budget); never more than the per-host
+# pool, or queued pages would spend their timeout waiting for a connection
+MARKETS_CONCURRENCY = HTTP_POOL_PER_HOST
+MAX_MARKETS = 10000  # safety cap on the number of markets scanned
+# Server-side prefilter: open markets carrying the weather tag. /markets
+# filters by tag_id, which is resolved from the slug once per run. The
+# question regexes below still apply as a safety net
+GAMMA_MARKET_FILTERS = {"closed": "false"}
+GAMMA_WEATHER_TAG_SLUG = "weather"
+
+# City coordinates for NWS grid point lookups
+_CITY_COORDS = {
+    "London": (51.5074, -0.1278),
+    "New York": (40.7128, -74.0060),
+    "Chicago": (41.8781, -87.6298),
+}
+
+# Market question filters, matched against the casefolded question
+_WEATHER_RE = re.compile(r"temperature|temp\b|°[fc]")
+_CITY_RE = re.compile("|".join(re.escape(city.casefold()) for city in TARGET_CITIES))
+_CITY_NAMES = {city.casefold(): city for city in TARGET_CITIES}
+
+# Response transfer stats: every response's decoded size, plus wire size
+# (Content-Length) where the server sent one - chunked responses don't
+_TRANSFER_STATS = {
+    "responses": 0,
+    "compressed": 0,  # responses with a Content-Encoding
+    "decoded": 0,  # bytes after decompression, all responses
+    "sized": 0,  # responses with a Content-Length
+    "sized_wire": 0,  # bytes on the wire for those responses
+    "sized_decoded": 0,  # bytes after decompression for those responses
+}
+
+# Lazily opened sqlite connection backing the HTTP response cache
+_DISK_CACHE = None
 
-def fetch_noaa_forecast(city, threshold):
+# Gamma tag id for GAMMA_WEATHER_TAG_SLUG, resolved on first use
+_WEATHER_TAG_ID = None
+
+# city -> (((office, grid_x, grid_y), forecast_url), expiry_ts) from the
+# NWS points endpoint
+_GRID_CACHE = {}
+# (office, grid_x, grid_y) -> (task resolving to temp_f, expiry_ts) for the
+# next forecast period
+_FORECAST_CACHE = {}
+
+def create_session():
+    """Create the shared HTTP session with a keep-alive connection pool"""
+    connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, limit_per_host=HTTP_POOL_PER_HOST)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HTTP_HEADERS)
+
+def disk_cache():
+    """Open (once) the sqlite response cache, dropping expired entries"""
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        os.makedirs(os.path.dirname(HTTP_CACHE_PATH), exist_ok=True)
+        _DISK_CACHE = sqlite3.connect(HTTP_CACHE_PATH)
+        _DISK_CACHE.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        _DISK_CACHE.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        _DISK_CACHE.commit()
+    return _DISK_CACHE
+
+def disk_cache_get(key):
+    """Return the cached response body for key, or None if missing/expired"""
+    row = disk_cache().execute(
+        "SELECT body FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+    ).fetchone()
+    return row[0] if row else None
+
+def disk_cache_put(key, body):
     """
-    Fetch NOAA forecast for a city and calculate probability
+    Store a response body for HTTP_CACHE_TTL seconds
     
-    Returns probability that temperature exceeds threshold
+    Jittered like the in-memory forecast cache, so entries written in the
+    same run don't all expire together on the next one
     """
-    # City coordinates
-    coords = {
-        "London": (51.5074, -0.1278),
-        "New York": (40.7128, -74.0060),
-        "Chicago": (41.8781, -87.6298),
-    }
+    jitter = random.uniform(-FORECAST_CACHE_JITTER, FORECAST_CACHE_JITTER)
+    disk_cache().execute(
+        "INSERT OR REPLACE INTO responses (key, body, expires) VALUES (?, ?, ?)",
+        (key, body, time.time() + HTTP_CACHE_TTL * (1 + jitter)),
+    )
+    disk_cache().commit()
+
+async def fetch_json(session, url, params=None):
+    """
+    GET a URL and decode its JSON body
+    
+    Successful responses are cached on disk for HTTP_CACHE_TTL so re-runs
+    don't re-fetch. Retries connection errors, timeouts and
+    HTTP_RETRY_STATUSES with exponential backoff (or the server's
+    Retry-After); other HTTP errors are raised immediately
+    """
+    cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    if HTTP_CACHE_TTL:
+        cached = disk_cache_get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
+    
+    for attempt in range(HTTP_RETRIES + 1):
+        final_attempt = attempt == HTTP_RETRIES
+        delay = HTTP_BACKOFF * 2 ** attempt
+        try:
+            async with session.get(url, params=params) as response:
+                # Honour the server's Retry-After (delta-seconds form) on
+                # 429/503; give up rather than wait longer than allowed
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit() and int(retry_after) > HTTP_MAX_RETRY_AFTER:
+                    final_attempt = True
+                elif retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                
+                if response.status not in HTTP_RETRY_STATUSES or final_attempt:
+                    response.raise_for_status()
+                    body = await response.read()
+                    _TRANSFER_STATS["responses"] += 1
+                    _TRANSFER_STATS["decoded"] += len(body)
+                    if response.headers.get("Content-Encoding", "identity") != "identity":
+                        _TRANSFER_STATS["compressed"] += 1
+                    if response.content_length is not None:
+                        _TRANSFER_STATS["sized"] += 1
+                        _TRANSFER_STATS["sized_wire"] += response.content_length
+                        _TRANSFER_STATS["sized_decoded"] += len(body)
+                    data = orjson.loads(body)
+                    if HTTP_CACHE_TTL:
+                        disk_cache_put(cache_key, body)
+                    return data
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if final_attempt:
+                raise
+        
+        await asyncio.sleep(delay)
+
+async def fetch_grid_point(session, city, lat, lon):
+    """
+    Resolve the NWS grid cell and hourly forecast URL for a city
+    
+    Returns ((office, grid_x, grid_y), forecast_url); the lookup is cached
+    per city for GRID_CACHE_TTL
+    """
+    cached = _GRID_CACHE.get(city)
+    if cached and time.time() < cached[1]:
+        return cached[0]
+    
+    # Get NOAA grid point
+    grid_url = f"https://api.weather.gov/points/{lat},{lon}"
+    
+    grid_data = await fetch_json(session, grid_url)
+    
+    properties = grid_data["properties"]
+    grid_key = (properties["gridId"], properties["gridX"], properties["gridY"])
+    grid_point = (grid_key, properties["forecastHourly"])
+    _GRID_CACHE[city] = (grid_point, time.time() + GRID_CACHE_TTL)
+    
+    return grid_point
+
+async def fetch_grid_temp(session, forecast_url):
+    """Fetch the next hourly forecast temperature (°F) from an NWS grid URL"""
+    forecast_data = await fetch_json(session, forecast_url)
+    
+    # Get first period (next few hours)
+    period = forecast_data["properties"]["periods"][0]
+    return period["temperature"]
+
+async def fetch_forecast_temp(session, city, lat, lon):
+    """
+    Fetch the next hourly forecast temperature (°F) for a city
+    
+    Cached per NWS grid cell for FORECAST_CACHE_TTL (plus jitter), so cities
+    sharing a cell share one request, including one already in flight. The
+    expiry is set on a miss and not extended on hits, so entries never
+    outlive the data
+    """
+    grid_key, forecast_url = await fetch_grid_point(session, city, lat, lon)
+    
+    cached = _FORECAST_CACHE.get(grid_key)
+    if cached and time.time() < cached[1]:
+        task = cached[0]
+    else:
+        task = asyncio.create_task(fetch_grid_temp(session, forecast_url))
+        jitter = random.uniform(-FORECAST_CACHE_JITTER, FORECAST_CACHE_JITTER)
+        _FORECAST_CACHE[grid_key] = (task, time.time() + FORECAST_CACHE_TTL * (1 + jitter))
+        task.add_done_callback(lambda t: _evict_failed_forecast(grid_key, t))
     
-    if city not in coords:
+    # Shielded so cancelling one waiter doesn't cancel the fetch the other
+    # cities sharing this grid cell are waiting on
+    return await asyncio.shield(task)
+
+def _evict_failed_forecast(grid_key, task):
+    """Drop a failed forecast fetch so it isn't cached for the rest of the TTL"""
+    if task.cancelled() or task.exception() is not None:
+        if _FORECAST_CACHE.get(grid_key, (None,))[0] is task:
+            del _FORECAST_CACHE[grid_key]
+
+async def fetch_noaa_forecast(session, city):
+    """
+    Fetch NOAA forecast temperature for a city
+    
+    Returns forecast mean temperature in °F, or None if unavailable
+    """
+    if city not in _CITY_COORDS:
         return None
     
-    lat, lon = coords[city]
+    lat, lon = _CITY_COORDS[city]
     
     try:
-        # Get NOAA grid point
-        grid_url = f"https://api.weather.gov/points/{lat},{lon}"
-        headers = {"User-Agent": "PolymarketValidation/1.0"}
-        
-        grid_response = requests.get(grid_url, headers=headers, timeout=10)
-        grid_data = grid_response.json()
-        
-        forecast_url = grid_data["properties"]["forecastHourly"]
-        
-        # Fetch hourly forecast
-        forecast_response = requests.get(forecast_url, headers=headers, timeout=10)
-        forecast_data = forecast_response.json()
-        
-        # Get first period (next few hours)
-        period = forecast_data["properties"]["periods"][0]
-        temp_f = period["temperature"]
-        
-        # Convert to Celsius
-        temp_c = (temp_f - 32.0) * 5.0 / 9.0
-        
-        # Simple probability model: normal distribution with σ=2.5°C
-        # P(temp > threshold) using z-score
-        std_dev = 2.5
-        z = (threshold - temp_c) / std_dev
-        
-        # Approximate normal CDF
-        from math import erf, sqrt
-        probability = 0.5 * (1 + erf(z / sqrt(2)))
-        probability_above = 1.0 - probability
-        
-        return {
-            "probability": probability_above,
-            "mean_temp": temp_c,
-            "confidence": 0.95,
-        }
+        return await fetch_forecast_temp(session, city, lat, lon)
         
     except Exception as e:
         print(f"Error fetching NOAA forecast for {city}: {e}")
         return None
 
-def fetch_polymarket_markets():
-    """Fetch weather markets from Polymarket Gamma API"""
+def forecast_probabilities(temps_f, thresholds_f):
+    """
+    Calculate probability that temperature exceeds threshold
+    
+    Vectorized over arrays of forecast temperatures and thresholds (°F)
+    """
+    temps = np.asarray(temps_f, dtype=np.float32)
+    thresholds = np.asarray(thresholds_f, dtype=np.float32)
+    
+    # Simple probability model: normal distribution with σ=2.5°C (4.5°F)
+    # P(temp > threshold) = 1 - normal CDF of the z-score
+    return 1.0 - 0.5 * (1.0 + erf((thresholds - temps) * _INV_SIGMA_SQRT2))
+
+async def fetch_weather_tag_id(session):
+    """
+    Resolve the Gamma tag id for GAMMA_WEATHER_TAG_SLUG (once per run)
+    
+    Returns None if the lookup fails
+    """
+    global _WEATHER_TAG_ID
+    if _WEATHER_TAG_ID is None:
+        try:
+            tag = await fetch_json(session, f"{GAMMA_TAGS_URL}/{GAMMA_WEATHER_TAG_SLUG}")
+            _WEATHER_TAG_ID = str(tag["id"])
+        except Exception as e:
+            print(f"Error resolving Gamma tag '{GAMMA_WEATHER_TAG_SLUG}': {e}")
+    return _WEATHER_TAG_ID
+
+async def fetch_market_pages(session, filters):
+    """
+    Fetch every market matching the query filters in pages
+    
+    The first page is fetched alone, since a filtered feed usually fits in
+    one. Only if it comes back full are later pages fetched, in waves of
+    MARKETS_CONCURRENCY. The scan stops at the first short page (the end
+    of the feed) or the first page that still fails after retries, keeping
+    the markets read before it
+    """
+    async def fetch_page(offset):
+        params = {**filters, "limit": MARKETS_PAGE_SIZE, "offset": offset}
+        page = await fetch_json(session, GAMMA_API_URL, params=params)
+        
+        # Gamma returns a bare list; tolerate the older {"data": [...]} shape
+        if isinstance(page, dict):
+            page = page.get("data", [])
+        return page
+    
+    markets = []
+    offsets = range(0, MAX_MARKETS, MARKETS_PAGE_SIZE)
+    wave_size = 1
+    
+    while offsets:
+        wave, offsets = offsets[:wave_size], offsets[wave_size:]
+        wave_size = MARKETS_CONCURRENCY
+        pages = await asyncio.gather(
+            *[fetch_page(offset) for offset in wave], return_exceptions=True
+        )
+        
+        for offset, page in zip(wave, pages):
+            if isinstance(page, Exception):
+                print(f"Error fetching Polymarket markets at offset {offset}: {page}")
+                return markets
+            markets.extend(page)
+            if len(page) < MARKETS_PAGE_SIZE:
+                return markets
+    
+    # Every page up to the cap came back full
+    print(f"Warning: market scan stopped at MAX_MARKETS={MAX_MARKETS}; later markets were not checked")
+    return markets
+
+async def fetch_polymarket_markets(session):
+    """
+    Fetch weather markets from Polymarket Gamma API
+    
+    Returns a list of (city, threshold, threshold_f, market) tuples for
+    the target cities, with the threshold in both °C and °F
+    """
     try:
-        response = requests.get(GAMMA_API_URL, timeout=10)
-        markets_data = response.json()
+        filters = dict(GAMMA_MARKET_FILTERS)
+        tag_id = await fetch_weather_tag_id(session)
+        if tag_id is not None:
+            filters["tag_id"] = tag_id
+        else:
+            print("Warning: weather tag unavailable - scanning all open markets")
         
-        # Filter for weather markets
+        all_markets = await fetch_market_pages(session, filters)
+        
+        # Filter for weather markets, extracting the city in the same pass
         weather_markets = []
-        for market in markets_data.get("data", []):
-            question = market.get("question", "").lower()
+        for market in all_markets:
+            question = market.get("question", "").casefold()
             
-            is_weather = any([
-                "temperature" in question,
-                "temp" in question,
-                "°f" in question,
-                "°c" in question,
-            ])
+            if not _WEATHER_RE.search(question):
+                continue
             
-            has_target_city = any([
-                city.lower() in question
-                for city in TARGET_CITIES
-            ])
+            city_match = _CITY_RE.search(question)
+            if not city_match:
+                continue
             
-            if is_weather and has_target_city:
-                weather_markets.append(market)
+            # Extract threshold (simplified - would need regex in production)
+            # For validation, we'll use a default threshold
+            threshold = VALIDATION_THRESHOLD
+            threshold_f = threshold * 9.0 / 5.0 + 32.0
+            
+            weather_markets.append((_CITY_NAMES[city_match.group(0)], threshold, threshold_f, market))
         
         return weather_markets
         
@@ -124,7 +421,168 @@ def calculate_edge(forecast_prob, market_price):
     """Calculate edge between forecast and market"""
     return abs(forecast_prob - market_price)
 
-def main():
+async def with_timeout(coro, default, label):
+    """Await coro for at most DAY_FETCH_TIMEOUT, returning default on timeout"""
+    try:
+        return await asyncio.wait_for(coro, DAY_FETCH_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"{label} timed out after {DAY_FETCH_TIMEOUT}s")
+        return default
+
+async def fetch_day(session):
+    """
+    Fetch today's markets and NOAA forecasts concurrently
+    
+    Returns (markets, temps) where temps maps city -> forecast temp (°F)
+    """
+    # Forecasts depend only on the city, so every city's forecast can be
+    # requested alongside the market list instead of once per market. Each
+    # fetch is bounded on its own so a slow Gamma scan can't discard
+    # forecasts that already arrived (or vice versa)
+    markets, *city_temps = await asyncio.gather(
+        with_timeout(fetch_polymarket_markets(session), [], "Polymarket market fetch"),
+        *[
+            with_timeout(fetch_noaa_forecast(session, city), None, f"NOAA forecast for {city}")
+            for city in TARGET_CITIES
+        ],
+    )
+    
+    temps = {
+        city: temp_f
+        for city, temp_f in zip(TARGET_CITIES, city_temps)
+        if temp_f is not None
+    }
+    
+    return markets, temps
+
+def record_opportunities(writer, date_str, markets, temps):
+    """
+    Compare each market against its city's forecast and write CSV rows
+    
+    Returns (day_results, questions): the day's RESULT_DTYPE array and the
+    matching market questions, row for row
+    """
+    # NOAA forecast was fetched once per city in fetch_day
+    scored = [m for m in markets if m[0] in temps]
+    questions = [market.get("question", "") for _, _, _, market in scored]
+    
+    day_results = np.empty(len(scored), dtype=RESULT_DTYPE)
+    day_results['city_id'] = [CITY_IDS[city] for city, _, _, _ in scored]
+    day_results['threshold'] = [threshold for _, threshold, _, _ in scored]
+    day_results['date'] = np.datetime64(date_str, 'D')
+    
+    # Score every market in a single vectorized call
+    day_results['forecast_prob'] = forecast_probabilities(
+        [temps[city] for city, _, _, _ in scored],
+        [threshold_f for _, _, threshold_f, _ in scored],
+    )
+    
+    # Get market price (simplified - would need CLOB API in production)
+    # For validation, we'll simulate market price
+    day_results['market_price'] = 0.5  # Placeholder
+    
+    # Calculate edge
+    day_results['edge'] = calculate_edge(day_results['forecast_prob'], day_results['market_price'])
+    
+    for (city, threshold, _, _), question, result in zip(scored, questions, day_results):
+        # Write to CSV
+        writer.writerow([
+            date_str,
+            city,
+            threshold,
+            f"{result['forecast_prob']:.3f}",
+            f"{result['market_price']:.3f}",
+            f"{result['edge']:.3f}",
+            question,
+        ])
+        
+        print(f"  {city}: forecast={result['forecast_prob']:.1%}, market={result['market_price']:.1%}, edge={result['edge']:.1%}")
+    
+    return day_results, questions
+
+def write_results_parquet(results, questions):
+    """
+    Write the results column store to RESULTS_PARQUET in one call
+    
+    Skipped when pyarrow is not installed; the CSV is always written
+    """
+    if pa is None:
+        print(f"pyarrow not installed - skipping {RESULTS_PARQUET}")
+        return
+    
+    table = pa.table({
+        'date': results['date'],
+        'city': pa.DictionaryArray.from_arrays(results['city_id'], TARGET_CITIES),
+        'threshold': results['threshold'],
+        'forecast_prob': results['forecast_prob'],
+        'market_price': results['market_price'],
+        'edge': results['edge'],
+        'question': pa.array(questions, type=pa.string()),
+    })
+    pq.write_table(table, RESULTS_PARQUET, compression='zstd')
+    print(f"Results written to {RESULTS_PARQUET}")
+
+async def produce_days(session, queue):
+    """
+    Fetch each day's markets and forecasts and hand them to the consumer
+    
+    Queues (day, date_str, markets, temps) per day, then None when done
+    """
+    try:
+        for day in range(VALIDATION_DAYS):
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            
+            # Fetch Polymarket markets and NOAA forecasts concurrently,
+            # each bounded so a hung request can't stall the whole run
+            markets, temps = await fetch_day(session)
+            
+            await queue.put((day, date_str, markets, temps))
+            
+            # Wait until the next daily snapshot
+            if day < VALIDATION_DAYS - 1:
+                await asyncio.sleep(DAY_INTERVAL)
+    finally:
+        queue.put_nowait(None)
+
+async def consume_days(queue, writer, results_file):
+    """
+    Score, log and store each day's data as the producer delivers it
+    
+    Returns (results, questions, n_results) once the producer signals it
+    is done; questions[i] is the market question for results[i]
+    """
+    # Preallocated column store; city names are looked up by city_id.
+    # Question text is kept alongside in a plain list
+    results = np.empty(VALIDATION_DAYS * MAX_OPPS_PER_DAY, dtype=RESULT_DTYPE)
+    questions = []
+    n_results = 0
+    
+    while True:
+        item = await queue.get()
+        if item is None:
+            return results, questions, n_results
+        day, date_str, markets, temps = item
+        
+        print(f"\n--- Day {day + 1}/{VALIDATION_DAYS} ---")
+        print(f"Found {len(markets)} weather markets")
+        
+        day_results, day_questions = record_opportunities(writer, date_str, markets, temps)
+        n_end = n_results + len(day_results)
+        if n_end > len(results):
+            results = np.resize(results, max(n_end, 2 * len(results)))
+        results[n_results:n_end] = day_results
+        questions.extend(day_questions)
+        n_results = n_end
+        results_file.flush()
+        
+        print(f"Opportunities found today: {len(day_results)}")
+        if n_results:
+            print(f"Running average edge: {results['edge'][:n_results].mean():.1%}")
+        
+        if day < VALIDATION_DAYS - 1:
+            print(f"Waiting {timedelta(seconds=DAY_INTERVAL)} until the next day...")
+
+async def main():
     print("=" * 60)
     print("POLYMARKET WEATHER TRADING THESIS VALIDATION")
     print("=" * 60)
@@ -132,9 +590,15 @@ def main():
     print(f"Target cities: {', '.join(TARGET_CITIES)}")
     print()
     
-    # Initialize results CSV
-    with open(RESULTS_CSV, 'w', newline='') as f:
-        writer = csv.writer(f)
+    # Cancel cleanly on Ctrl+C, even while waiting between days
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # No loop signal handlers on Windows; KeyboardInterrupt still applies
+    
+    # Results CSV stays open for the whole run and is flushed once per day
+    with open(RESULTS_CSV, 'w', newline='', buffering=65536) as results_file:
+        writer = csv.writer(results_file)
         writer.writerow([
             'date',
             'city',
@@ -144,109 +608,51 @@ def main():
             'edge',
             'question',
         ])
+        
+        # One session for the whole run so connections are pooled and kept alive
+        async with create_session() as session:
+            # Fetching runs in the background; this coroutine does the
+            # per-day bookkeeping as each day's data arrives
+            queue = asyncio.Queue()
+            producer = asyncio.create_task(produce_days(session, queue))
+            try:
+                results, questions, n_results = await consume_days(queue, writer, results_file)
+                await producer  # surface any fetch error
+            finally:
+                producer.cancel()
     
-    results = []
-    day = 0
+    stats = _TRANSFER_STATS
+    print(f"\nHTTP transfer: {stats['responses']} responses ({stats['compressed']} compressed), "
+          f"{stats['decoded'] / 1024:.0f} KB decoded")
+    print(f"  With Content-Length: {stats['sized']} responses, {stats['sized_wire'] / 1024:.0f} KB "
+          f"on the wire for {stats['sized_decoded'] / 1024:.0f} KB decoded")
     
-    while day < VALIDATION_DAYS:
-        print(f"\n--- Day {day + 1}/{VALIDATION_DAYS} ---")
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        # Fetch Polymarket markets
-        markets = fetch_polymarket_markets()
-        print(f"Found {len(markets)} weather markets")
-        
-        day_opportunities = 0
-        
-        for market in markets:
-            question = market.get("question", "")
-            
-            # Extract city
-            city = None
-            for target_city in TARGET_CITIES:
-                if target_city.lower() in question.lower():
-                    city = target_city
-                    break
-            
-            if not city:
-                continue
-            
-            # Extract threshold (simplified - would need regex in production)
-            # For validation, we'll use a default threshold
-            threshold = 15.0  # °C (59°F)
-            
-            # Fetch NOAA forecast
-            forecast = fetch_noaa_forecast(city, threshold)
-            if not forecast:
-                continue
-            
-            # Get market price (simplified - would need CLOB API in production)
-            # For validation, we'll simulate market price
-            market_price = 0.5  # Placeholder
-            
-            # Calculate edge
-            edge = calculate_edge(forecast["probability"], market_price)
-            
-            # Log result
-            result = {
-                'date': date_str,
-                'city': city,
-                'threshold': threshold,
-                'forecast_prob': forecast["probability"],
-                'market_price': market_price,
-                'edge': edge,
-                'question': question,
-            }
-            
-            results.append(result)
-            day_opportunities += 1
-            
-            # Write to CSV
-            with open(RESULTS_CSV, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    result['date'],
-                    result['city'],
-                    result['threshold'],
-                    f"{result['forecast_prob']:.3f}",
-                    f"{result['market_price']:.3f}",
-                    f"{result['edge']:.3f}",
-                    result['question'],
-                ])
-            
-            print(f"  {city}: forecast={forecast['probability']:.1%}, market={market_price:.1%}, edge={edge:.1%}")
-        
-        print(f"Opportunities found today: {day_opportunities}")
-        
-        # Wait 24 hours (or speed up for testing)
-        if day < VALIDATION_DAYS - 1:
-            print("Waiting 24 hours...")
-            # time.sleep(86400)  # Uncomment for real 24h wait
-            time.sleep(1)  # For testing: just wait 1 second
-        
-        day += 1
+    write_results_parquet(results[:n_results], questions)
     
     # Analyze results
     print("\n" + "=" * 60)
     print("VALIDATION RESULTS")
     print("=" * 60)
     
-    if len(results) == 0:
+    if n_results == 0:
         print("❌ VALIDATION FAILED: No opportunities found")
         return False
     
-    edges = [r['edge'] for r in results]
-    avg_edge = statistics.mean(edges)
-    opportunities_per_day = len(results) / VALIDATION_DAYS
+    edges = results['edge'][:n_results]
+    avg_edge = float(edges.mean())
+    edge_std = float(edges.std())
+    edge_p50, edge_p90, edge_p95 = np.percentile(edges, [50, 90, 95])
+    opportunities_per_day = n_results / VALIDATION_DAYS
     
     # Simulated win rate (would need actual outcomes for real validation)
     # For demo purposes, assume 70% win rate
     win_rate = 0.70
     
-    print(f"\nAverage edge: {avg_edge:.1%}")
+    print(f"\nAverage edge: {avg_edge:.1%} (σ={edge_std:.1%})")
+    print(f"Edge percentiles: p50={edge_p50:.1%}, p90={edge_p90:.1%}, p95={edge_p95:.1%}")
     print(f"Win rate: {win_rate:.1%} (simulated - needs real outcomes)")
     print(f"Opportunities per day: {opportunities_per_day:.1f}")
-    print(f"Total opportunities: {len(results)}")
+    print(f"Total opportunities: {n_results}")
     
     # Check success criteria
     print("\n--- Success Criteria ---")
@@ -272,9 +678,9 @@ def main():
 
 if __name__ == "__main__":
     try:
-        success = main()
+        success = asyncio.run(main())
         exit(0 if success else 1)
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\nValidation interrupted by user")
         exit(1)
     except Exception as e: